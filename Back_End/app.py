@@ -3,11 +3,18 @@ from __future__ import annotations
 import os
 import math
 import asyncio
-from typing import Optional, Literal, List, Dict, Any, Tuple
+import hashlib
+import re
+from contextlib import asynccontextmanager
+from typing import Optional, Literal, List, Dict, Any, Tuple, get_args
 
 import httpx
-from fastapi import FastAPI, Query, HTTPException, Body
+import numpy as np
+import orjson
+from cachetools import TTLCache
+from fastapi import FastAPI, Query, HTTPException, Body, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
@@ -20,22 +27,54 @@ GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "").strip()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "").strip()  # This will be your OpenRouter API key
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", OPENAI_API_KEY).strip()  # Use OPENROUTER_API_KEY if set, otherwise fall back to OPENAI_API_KEY
 DEFAULT_RADIUS_METERS = int(os.getenv("DEFAULT_RADIUS_METERS", "5000"))
-
-GOOGLE_PLACES_NEARBY_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
-GOOGLE_PLACES_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+FAST_DISTANCE_MAX_METERS = 100_000  # above this, fall back to exact haversine
+
+GOOGLE_PLACES_SEARCH_URL = "https://places.googleapis.com/v1/places:searchText"
+GOOGLE_PLACES_PHOTO_URL = "https://places.googleapis.com/v1/{name}/media"
+
+# Only the fields /providers reads, to keep responses small. Opening hours and ratings already
+# put Text Search in its Enterprise (top) billing tier, which also covers phone and website,
+# so those come from the search too instead of a Place Details call per result
+PLACES_SEARCH_FIELD_MASK = ",".join((
+    "places.id",
+    "places.displayName",
+    "places.location",
+    "places.formattedAddress",
+    "places.currentOpeningHours.openNow",
+    "places.rating",
+    "places.userRatingCount",
+    "places.photos",
+    "places.nationalPhoneNumber",
+    "places.websiteUri",
+))
 
 Category = Literal["dental", "primary_care", "urgent_care", "optometrist", "mental_health"]
-
-# Map your UI categories to Google Places "type" + keyword
-# (Places has a limited list of types; keywords refine results)
-CATEGORY_SEARCH: Dict[str, Dict[str, str]] = {
-    "dental": {"type": "dentist", "keyword": "dental clinic"},
-    "primary_care": {"type": "doctor", "keyword": "primary care physician"},
-    "urgent_care": {"type": "hospital", "keyword": "urgent care"},
-    "optometrist": {"type": "optometrist", "keyword": "optometrist"},
-    "mental_health": {"type": "doctor", "keyword": "therapy psychologist counseling mental health"},
+_VALID_CATEGORIES: frozenset[str] = frozenset(get_args(Category))
+
+# Map your UI categories to Google Places (type, keyword)
+# (types must be Places API (New) place types and are filtered strictly; None searches by
+# keyword alone: there is no optometrist type, and urgent care clinics are often tagged
+# doctor or medical clinic rather than hospital)
+CATEGORY_SEARCH: Dict[str, Tuple[Optional[str], str]] = {
+    "dental": ("dentist", "dental clinic"),
+    "primary_care": ("doctor", "primary care physician"),
+    "urgent_care": (None, "urgent care"),
+    "optometrist": (None, "optometrist eye exam"),
+    "mental_health": ("doctor", "therapy psychologist counseling mental health"),
 }
 
+# System prompt for the /api/analyze-health-need OpenRouter fallback
+ANALYZE_SYSTEM_PROMPT = """You are a healthcare assistant helping students at UCSB determine which type of healthcare provider they need.
+Based on the user's description, suggest one or more of the following provider types (comma-separated if multiple):
+- dental (for dental issues, tooth pain, oral health, cleanings)
+- primary_care (for general health, check-ups, non-urgent medical issues, ongoing care)
+- urgent_care (for immediate but non-life-threatening medical attention, injuries, sudden illness)
+- optometrist (for eye exams, vision problems, eye care)
+- mental_health (for mental health, therapy, counseling, emotional support, anxiety, depression)
+
+If multiple provider types could help, list them all separated by commas.
+Respond with ONLY the provider type key(s) in lowercase, comma-separated if multiple (e.g., "dental" or "primary_care, urgent_care"), nothing else."""
+
 # -----------------------------
 # Helpers
 # -----------------------------
@@ -56,29 +95,117 @@ def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     return R * c
 
-def google_maps_place_photo_url(photo_reference: str, maxwidth: int = 900) -> str:
-    return (
-        "https://maps.googleapis.com/maps/api/place/photo"
-        f"?maxwidth={maxwidth}&photo_reference={photo_reference}&key={GOOGLE_MAPS_API_KEY}"
-    )
+def haversine_miles_vec(lat1: float, lng1: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Distances in miles from one lat/lng point to arrays of points (vectorized haversine_miles)."""
+    R = 3958.8
+    phi1 = math.radians(lat1)
+    phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lngs - lng1)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
 
-# Small in-memory cache (hackathon-friendly)
-_CACHE: Dict[str, Tuple[float, Any]] = {}
+def fast_distance_miles(user_lat: float, user_lng: float, plats: np.ndarray, plngs: np.ndarray) -> np.ndarray:
+    """
+    Equirectangular approximation of haversine_miles_vec.
+    Within a few hundredths of a mile at the radii /providers allows (ordering is preserved);
+    use haversine for anything over ~100 km.
+    """
+    R = 3958.8
+    cos_u = math.cos(math.radians(user_lat))
+    dphi = np.radians(plats - user_lat)
+    dlam = np.radians(plngs - user_lng) * cos_u
+    return R * np.sqrt(dphi * dphi + dlam * dlam)
+
+def place_photo_proxy_url(photo_base: str, photo_name: str, maxwidth: int = 900) -> str:
+    # photo_name is the Places API (New) resource name: places/{place_id}/photos/{photo_id}.
+    # Served through /photo so the Google API key never reaches the client; photo_base is the
+    # absolute /photo/ URL (resolved once per request), so pages served from another origin
+    # still load it from this backend.
+    return f"{photo_base}{photo_name}?maxwidth={maxwidth}"
+
+# places/{place_id}/photos/{photo_id}, with no room for extra or '..' segments
+_PHOTO_NAME_RE = re.compile(r"places/[\w-]+/photos/[\w-]+", re.ASCII)
+
+# photoUri per (photo name, width), so repeat renders of an image skip the billed Photo call
+PHOTO_URI_TTL_SECONDS = 3600
+_PHOTO_URI_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=PHOTO_URI_TTL_SECONDS)
+
+# Small in-memory cache of Places search results (hackathon-friendly): bounded LRU with per-entry TTL
 CACHE_TTL_SECONDS = 60
+_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=CACHE_TTL_SECONDS)
+# Lets browsers/CDNs reuse /providers responses for as long as we cache them server-side
+PROVIDERS_CACHE_CONTROL = f"public, max-age={CACHE_TTL_SECONDS}, stale-while-revalidate=300"
+
+def cached_json_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """200 with the body, or 304 if the client already holds this ETag."""
+    headers = {"ETag": etag, "Cache-Control": PROVIDERS_CACHE_CONTROL}
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Classifier answers keyed by normalized symptom text (repeat questions skip OpenRouter)
+ANALYZE_CACHE_TTL_SECONDS = 86400
+_ANALYZE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=ANALYZE_CACHE_TTL_SECONDS)
+_PUNCT_RE = re.compile(r"[^\w\s]+")
+_WS_RE = re.compile(r"\s+")
+
+# Keyword first pass for /api/analyze-health-need. Only unambiguous terms are listed;
+# anything matching several categories (or a red flag below) goes to OpenRouter instead
+SYMPTOM_KEYWORDS: Dict[str, List[str]] = {
+    "dental": [
+        "tooth", "teeth", "toothache", "cavity", "cavities", "gum", "gums", "floss", "dentist",
+        "dental", "molar", "wisdom tooth", "braces", "root canal",
+    ],
+    "primary_care": [
+        "checkup", "check-up", "vaccine", "vaccination", "flu shot", "prescription",
+        "refill", "blood pressure", "cholesterol", "diabetes", "chronic", "referral",
+        "cough", "rash", "allergies", "doctor",
+    ],
+    "urgent_care": [
+        "sprain", "sprained", "fracture", "fractured",
+        "injury", "injured", "bleeding", "stitches", "vomiting", "twisted", "urgent",
+    ],
+    "optometrist": [
+        "eye exam", "vision", "glasses", "contact lens", "blurry", "eyesight",
+        "optometrist", "see clearly",
+    ],
+    "mental_health": [
+        "anxiety", "anxious", "depression", "depressed", "therapy", "therapist", "counseling",
+        "counselor", "sad", "stress", "stressed", "panic", "lonely", "mental health", "grief",
+        "insomnia", "overwhelmed", "ptsd", "adhd",
+    ],
+}
+_SYMPTOM_RES: Dict[str, re.Pattern] = {
+    category: re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b", re.IGNORECASE)
+    for category, keywords in SYMPTOM_KEYWORDS.items()
+}
 
-def cache_get(key: str):
-    item = _CACHE.get(key)
-    if not item:
-        return None
-    ts, val = item
-    now = asyncio.get_event_loop().time()
-    if (now - ts) > CACHE_TTL_SECONDS:
-        _CACHE.pop(key, None)
+# Possible emergencies, trauma or severity: never answered from keywords alone
+RED_FLAG_TERMS: List[str] = [
+    "chest pain", "chest tightness", "breathing", "breathe", "short of breath", "shortness of breath",
+    "unconscious", "passed out", "fainted", "fainting", "seizure", "stroke", "numbness",
+    "severe bleeding", "allergic reaction", "swelling throat", "overdose", "suicide", "suicidal",
+    "kill myself", "self harm", "self-harm", "hurt myself",
+    "hit", "punched", "chemical", "worst", "head injury", "concussion", "can't see", "cannot see",
+    "lost vision", "vision loss",
+]
+_RED_FLAG_RE = re.compile(r"\b(?:" + "|".join(re.escape(k) for k in RED_FLAG_TERMS) + r")\b", re.IGNORECASE)
+
+def match_symptom_keywords(text: str) -> Optional[str]:
+    """The one category whose keywords appear in text, or None if zero or several match or a red flag is present."""
+    if _RED_FLAG_RE.search(text):
         return None
-    return val
+    matched = [category for category, rx in _SYMPTOM_RES.items() if rx.search(text)]
+    return matched[0] if len(matched) == 1 else None
 
-def cache_set(key: str, value: Any):
-    _CACHE[key] = (asyncio.get_event_loop().time(), value)
+def analyze_cache_key(text: str) -> str:
+    """Lowercase, drop punctuation, collapse whitespace, then hash."""
+    normalized = _WS_RE.sub(" ", _PUNCT_RE.sub(" ", text.lower())).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 # -----------------------------
 # Models
@@ -95,7 +222,7 @@ class ProviderOut(BaseModel):
     user_ratings_total: Optional[int] = None
     distance_miles: float
 
-    # Optional details (extra API calls)
+    # Optional details (only filled when include_details is set)
     phone: Optional[str] = None
     website: Optional[str] = None
 
@@ -117,7 +244,25 @@ class AnalyzeResponse(BaseModel):
 # -----------------------------
 # App
 # -----------------------------
-app = FastAPI(title="CareNav Backend (Google Places)", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for the whole process so Google/OpenRouter connections are kept alive
+    app.state.http = httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        http2=True,
+    )
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+
+app = FastAPI(
+    title="CareNav Backend (Google Places)",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -173,42 +318,42 @@ async def test_openrouter():
         }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {api_key}",
-                    "HTTP-Referer": "https://localhost:8000",
-                    "X-Title": "UC Ship Finder"
-                },
-                json={
-                    "model": "openai/gpt-4o-mini",
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": "Say 'test' if you can read this."
-                        }
-                    ],
-                    "max_tokens": 5
-                },
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "status": "success",
-                    "message": "OpenRouter API is ready!",
-                    "response": data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-                }
-            else:
-                error_data = response.json()
-                return {
-                    "status": "error",
-                    "message": f"API returned error: {error_data.get('error', {}).get('message', 'Unknown error')}",
-                    "status_code": response.status_code
-                }
+        client: httpx.AsyncClient = app.state.http
+        response = await client.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}",
+                "HTTP-Referer": "https://localhost:8000",
+                "X-Title": "UC Ship Finder"
+            },
+            json={
+                "model": "openai/gpt-4o-mini",
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": "Say 'test' if you can read this."
+                    }
+                ],
+                "max_tokens": 5
+            },
+            timeout=10.0
+        )
+        
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            return {
+                "status": "success",
+                "message": "OpenRouter API is ready!",
+                "response": data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+            }
+        else:
+            error_data = orjson.loads(response.content)
+            return {
+                "status": "error",
+                "message": f"API returned error: {error_data.get('error', {}).get('message', 'Unknown error')}",
+                "status_code": response.status_code
+            }
     except Exception as e:
         return {
             "status": "error",
@@ -218,8 +363,14 @@ async def test_openrouter():
 @app.post("/api/analyze-health-need", response_model=AnalyzeResponse)
 async def analyze_health_need(request: AnalyzeRequest):
     """
-    Analyzes user text using OpenRouter (or OpenAI) to suggest the appropriate healthcare provider type.
+    Analyzes user text to suggest the appropriate healthcare provider type.
+    Text that clearly names one provider type (and no red flag) is matched locally;
+    OpenRouter (or OpenAI) handles everything else.
     """
+    keyword_type = match_symptom_keywords(request.text)
+    if keyword_type:
+        return AnalyzeResponse(providerTypes=[keyword_type])
+
     api_key = OPENROUTER_API_KEY or OPENAI_API_KEY
     if not api_key:
         raise HTTPException(
@@ -227,67 +378,63 @@ async def analyze_health_need(request: AnalyzeRequest):
             detail="API key is not set. Set OPENROUTER_API_KEY or OPENAI_API_KEY in your .env file."
         )
     
+    ck = analyze_cache_key(request.text)
+    cached = _ANALYZE_CACHE.get(ck)
+    if cached:
+        return AnalyzeResponse(providerTypes=list(cached))
+
     try:
-        async with httpx.AsyncClient() as client:
-            # Use OpenRouter API endpoint
-            response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {api_key}",
-                    "HTTP-Referer": "https://localhost:8000",  # Optional: Your site URL
-                    "X-Title": "UC Ship Finder"  # Optional: Your app name
-                },
-                json={
-                    "model": "openai/gpt-4o-mini",  # OpenRouter format: provider/model-name
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": """You are a healthcare assistant helping students at UCSB determine which type of healthcare provider they need. 
-                            Based on the user's description, suggest one or more of the following provider types (comma-separated if multiple):
-                            - dental (for dental issues, tooth pain, oral health, cleanings)
-                            - primary_care (for general health, check-ups, non-urgent medical issues, ongoing care)
-                            - urgent_care (for immediate but non-life-threatening medical attention, injuries, sudden illness)
-                            - optometrist (for eye exams, vision problems, eye care)
-                            - mental_health (for mental health, therapy, counseling, emotional support, anxiety, depression)
-                            
-                            If multiple provider types could help, list them all separated by commas.
-                            Respond with ONLY the provider type key(s) in lowercase, comma-separated if multiple (e.g., "dental" or "primary_care, urgent_care"), nothing else."""
-                        },
-                        {
-                            "role": "user",
-                            "content": request.text
-                        }
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 50
-                },
-                timeout=30.0
+        client: httpx.AsyncClient = app.state.http
+        # Use OpenRouter API endpoint
+        response = await client.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}",
+                "HTTP-Referer": "https://localhost:8000",  # Optional: Your site URL
+                "X-Title": "UC Ship Finder"  # Optional: Your app name
+            },
+            json={
+                "model": "openai/gpt-4o-mini",  # OpenRouter format: provider/model-name
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": ANALYZE_SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": request.text
+                    }
+                ],
+                "temperature": 0.3,
+                "max_tokens": 50
+            },
+            timeout=30.0
+        )
+        
+        if response.status_code != 200:
+            error_data = orjson.loads(response.content)
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"OpenRouter API error: {error_data.get('error', {}).get('message', 'Unknown error')}"
             )
-            
-            if response.status_code != 200:
-                error_data = response.json()
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"OpenRouter API error: {error_data.get('error', {}).get('message', 'Unknown error')}"
-                )
-            
-            data = response.json()
-            response_text = data["choices"][0]["message"]["content"].strip().lower()
-            
-            # Parse comma-separated provider types
-            valid_types = ["dental", "primary_care", "urgent_care", "optometrist", "mental_health"]
-            provider_types = [pt.strip() for pt in response_text.split(",")]
-            
-            # Filter to only valid types and remove duplicates
-            provider_types = list(dict.fromkeys([pt for pt in provider_types if pt in valid_types]))
-            
-            # If no valid types found, default to primary_care
-            if not provider_types:
-                provider_types = ["primary_care"]
-            
-            return AnalyzeResponse(providerTypes=provider_types)
-            
+        
+        data = orjson.loads(response.content)
+        response_text = data["choices"][0]["message"]["content"].strip().lower()
+        
+        # Parse comma-separated provider types
+        provider_types = [pt.strip() for pt in response_text.split(",")]
+        
+        # Filter to only valid types and remove duplicates
+        provider_types = list(dict.fromkeys([pt for pt in provider_types if pt in _VALID_CATEGORIES]))
+        
+        # If no valid types found, default to primary_care
+        if not provider_types:
+            provider_types = ["primary_care"]
+        
+        _ANALYZE_CACHE[ck] = tuple(provider_types)
+        return AnalyzeResponse(providerTypes=provider_types)
+        
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Request timeout. Please try again.")
     except Exception as e:
@@ -302,60 +449,118 @@ async def places_nearby_search(
     lat: float,
     lng: float,
     radius_m: int,
-    place_type: str,
+    place_type: Optional[str],
     keyword: str,
     open_now: Optional[bool],
 ) -> Dict[str, Any]:
-    params = {
-        "key": GOOGLE_MAPS_API_KEY,
-        "location": f"{lat},{lng}",
-        "radius": str(radius_m),
-        "type": place_type,
-        "keyword": keyword,
+    # Places API (New) Text Search: unlike searchNearby it still takes a keyword and openNow.
+    # The search circle becomes its bounding box, since locationRestriction only accepts rectangles;
+    # always ask for a full page, because corner hits are trimmed away after the search.
+    dlat = radius_m / 111_000
+    dlng = radius_m / (111_000 * max(math.cos(math.radians(lat)), 1e-6))
+    body: Dict[str, Any] = {
+        "textQuery": keyword,
+        "pageSize": 20,
+        "locationRestriction": {
+            "rectangle": {
+                "low": {"latitude": lat - dlat, "longitude": lng - dlng},
+                "high": {"latitude": lat + dlat, "longitude": lng + dlng},
+            }
+        },
     }
+    if place_type:
+        body["includedType"] = place_type
+        body["strictTypeFiltering"] = True
     if open_now is True:
-        params["opennow"] = "true"
-
-    r = await client.get(GOOGLE_PLACES_NEARBY_URL, params=params, timeout=20)
-    data = r.json()
-
-    status = data.get("status")
-    if status not in ("OK", "ZERO_RESULTS"):
+        body["openNow"] = True
+
+    r = await client.post(
+        GOOGLE_PLACES_SEARCH_URL,
+        json=body,
+        headers={
+            "X-Goog-Api-Key": GOOGLE_MAPS_API_KEY,
+            "X-Goog-FieldMask": PLACES_SEARCH_FIELD_MASK,
+        },
+        timeout=20,
+    )
+    if r.status_code != 200:
+        # Error bodies aren't guaranteed to be JSON (e.g. an HTML 5xx page)
+        try:
+            error = orjson.loads(r.content).get("error", {}) or {}
+        except (orjson.JSONDecodeError, AttributeError):
+            error = {}
         raise HTTPException(
             status_code=502,
-            detail=f"Google Places error: {status} - {data.get('error_message','')}"
+            detail=f"Google Places error: {error.get('status', r.status_code)} - {error.get('message','')}"
         )
-    return data
-
-async def places_details(
-    client: httpx.AsyncClient,
-    *,
-    place_id: str,
-) -> Dict[str, Any]:
-    # Minimal fields to reduce quota usage
-    params = {
-        "key": GOOGLE_MAPS_API_KEY,
-        "place_id": place_id,
-        "fields": "formatted_phone_number,website",
-    }
-    r = await client.get(GOOGLE_PLACES_DETAILS_URL, params=params, timeout=20)
-    data = r.json()
-    if data.get("status") != "OK":
-        return {}
-    return data.get("result", {}) or {}
+    return orjson.loads(r.content)
+
+def _shape_results(
+    located: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    user_lat: float,
+    user_lng: float,
+    category: str,
+    radius_meters: int,
+    limit: int,
+    include_details: bool,
+    photo_base: str,
+) -> List[Dict[str, Any]]:
+    """
+    Turn (place, location) pairs into at most `limit` ProviderOut-shaped dicts with distances.
+    Places outside radius_meters are dropped first: the search only restricts to the circle's bounding box.
+    """
+    providers_out: List[Dict[str, Any]] = []
+
+    plats = np.fromiter((float(loc["latitude"]) for _, loc in located), dtype=np.float64, count=len(located))
+    plngs = np.fromiter((float(loc["longitude"]) for _, loc in located), dtype=np.float64, count=len(located))
+    distance_fn = fast_distance_miles if radius_meters <= FAST_DISTANCE_MAX_METERS else haversine_miles_vec
+    dists = distance_fn(user_lat, user_lng, plats, plngs)
+    radius_miles = radius_meters / 1609.344
+
+    # Plain dicts shaped like ProviderOut (no model instances on the hot path)
+    for (item, _), plat, plng, dist in zip(located, plats.tolist(), plngs.tolist(), dists.tolist()):
+        if dist > radius_miles:
+            continue
+        if len(providers_out) >= limit:
+            break
+        opening = item.get("currentOpeningHours")
+        is_open = opening.get("openNow") if opening else None
+        display_name = item.get("displayName")
+        photos = item.get("photos")
+        photo_name = photos[0].get("name") if photos else None
+
+        providers_out.append({
+            "place_id": item.get("id", ""),
+            "name": display_name.get("text", "Unknown") if display_name else "Unknown",
+            "category": category,
+            "address": item.get("formattedAddress") or "Address unavailable",
+            "lat": plat,
+            "lng": plng,
+            "open_now": is_open if isinstance(is_open, bool) else None,
+            "rating": item.get("rating"),
+            "user_ratings_total": item.get("userRatingCount"),
+            "distance_miles": round(dist, 2),
+            "phone": item.get("nationalPhoneNumber") if include_details else None,
+            "website": item.get("websiteUri") if include_details else None,
+            "photo_url": place_photo_proxy_url(photo_base, photo_name, maxwidth=900) if photo_name else None,
+        })
+
+    return providers_out
 
 # -----------------------------
 # Main endpoint (category-based)
 # -----------------------------
 @app.get("/providers", response_model=ProvidersResponse)
 async def providers(
+    request: Request,
     category: Category = Query(..., description="dental | primary_care | urgent_care | optometrist | mental_health"),
     user_lat: float = Query(..., description="User latitude"),
     user_lng: float = Query(..., description="User longitude"),
     radius_meters: int = Query(DEFAULT_RADIUS_METERS, ge=500, le=50000, description="Search radius in meters"),
     open_now: Optional[bool] = Query(None, description="If true, only return places open now"),
     limit: int = Query(15, ge=1, le=25, description="Max results"),
-    include_details: bool = Query(False, description="If true, fetch phone/website (more API calls)"),
+    include_details: bool = Query(False, description="If true, include phone/website"),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Returns real nearby providers using Google Places.
@@ -363,20 +568,24 @@ async def providers(
     """
     require_key()
 
-    search = CATEGORY_SEARCH.get(category)
-    if not search:
+    pair = CATEGORY_SEARCH.get(category)
+    if pair is None:
         raise HTTPException(status_code=400, detail="Invalid category")
-
-    # Cache key (rounded coords so cache hits more often)
-    ck = f"{category}:{user_lat:.4f},{user_lng:.4f}:{radius_meters}:{open_now}:{limit}:{include_details}"
-    cached = cache_get(ck)
-    if cached:
-        return cached
-
-    place_type = search["type"]
-    keyword = search["keyword"]
-
-    async with httpx.AsyncClient() as client:
+    place_type, keyword = pair
+
+    # Cache key: snap coords to a grid of ~radius/10 so nearby users share entries.
+    # Only the Places results are cached; distances are recomputed from each caller's
+    # own coordinates below, so sharing an entry never shifts distance_miles.
+    grid_m = max(1, radius_meters // 10)
+    deg_lat = grid_m / 111_000
+    key_lat = round(user_lat / deg_lat) * deg_lat
+    deg_lng = grid_m / (111_000 * max(math.cos(math.radians(key_lat)), 1e-6))
+    key_lng = round(user_lng / deg_lng) * deg_lng
+    ck = f"{category}:{key_lat:.5f},{key_lng:.5f}:{radius_meters}:{open_now}"
+    located = _CACHE.get(ck)
+
+    if located is None:
+        client: httpx.AsyncClient = app.state.http
         data = await places_nearby_search(
             client,
             lat=user_lat,
@@ -387,51 +596,62 @@ async def providers(
             open_now=open_now,
         )
 
-        results = data.get("results", []) or []
-        providers_out: List[ProviderOut] = []
-
-        for item in results[:limit]:
-            loc = (item.get("geometry") or {}).get("location") or {}
-            plat = loc.get("lat")
-            plng = loc.get("lng")
-            if plat is None or plng is None:
-                continue
-
-            dist = haversine_miles(user_lat, user_lng, float(plat), float(plng))
-            opening = item.get("opening_hours") or {}
-            is_open = opening.get("open_now")
-
-            photo_url = None
-            photos = item.get("photos") or []
-            if photos and photos[0].get("photo_reference"):
-                photo_url = google_maps_place_photo_url(photos[0]["photo_reference"], maxwidth=900)
-
-            providers_out.append(
-                ProviderOut(
-                    place_id=item.get("place_id", ""),
-                    name=item.get("name", "Unknown"),
-                    category=category,
-                    address=item.get("vicinity") or item.get("formatted_address") or "Address unavailable",
-                    lat=float(plat),
-                    lng=float(plng),
-                    open_now=is_open if isinstance(is_open, bool) else None,
-                    rating=item.get("rating"),
-                    user_ratings_total=item.get("user_ratings_total"),
-                    distance_miles=round(dist, 2),
-                    photo_url=photo_url,
-                )
-            )
+        results = data.get("places") or []
+
+        # Keep only results with a usable location (the whole page: the radius and limit
+        # are applied per request when shaping), then compute all distances in one pass
+        located = []
+        for item in results:
+            loc = item.get("location")
+            if loc and loc.get("latitude") is not None and loc.get("longitude") is not None:
+                located.append((item, loc))
+        _CACHE[ck] = located
+
+    # Distance math and dict building are pure CPU; run them off the event loop
+    photo_base = str(request.url_for("place_photo", photo_name=""))
+    providers_out = await asyncio.to_thread(
+        _shape_results, located, user_lat, user_lng, category, radius_meters, limit, include_details, photo_base
+    )
 
-        # Optional details (phone/website) — extra requests
-        if include_details and providers_out:
-            async def add_details(p: ProviderOut):
-                d = await places_details(client, place_id=p.place_id)
-                p.phone = d.get("formatted_phone_number")
-                p.website = d.get("website")
-                return p
+    # Serialize once per request; the ETag is derived from this caller's body.
+    # Returning a Response directly skips FastAPI's response_model validation;
+    # response_model stays on the route for the OpenAPI schema
+    body = orjson.dumps({"providers": providers_out})
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return cached_json_response(body, etag, if_none_match)
 
-            providers_out = list(await asyncio.gather(*[add_details(p) for p in providers_out]))
+# -----------------------------
+# Photo proxy
+# -----------------------------
+@app.get("/photo/{photo_name:path}")
+async def place_photo(
+    photo_name: str,
+    maxwidth: int = Query(900, ge=1, le=4800, description="Max photo width in pixels"),
+):
+    """
+    Redirects to a Google Places photo without exposing the API key.
+    The key is sent server-side; the client is sent to the keyless photoUri Google returns.
+    """
+    require_key()
 
-        resp = ProvidersResponse(providers=providers_out)
-        cache_set(ck, resp)
-        return resp
+    if not _PHOTO_NAME_RE.fullmatch(photo_name):
+        raise HTTPException(status_code=400, detail="Invalid photo reference")
+
+    ck = (photo_name, maxwidth)
+    photo_uri = _PHOTO_URI_CACHE.get(ck)
+    if photo_uri is None:
+        client: httpx.AsyncClient = app.state.http
+        r = await client.get(
+            GOOGLE_PLACES_PHOTO_URL.format(name=photo_name),
+            params={"maxWidthPx": maxwidth, "skipHttpRedirect": "true"},
+            headers={"X-Goog-Api-Key": GOOGLE_MAPS_API_KEY},
+            timeout=20,
+        )
+        # Error bodies aren't guaranteed to be JSON, so check the status before parsing
+        if r.status_code != 200:
+            raise HTTPException(status_code=404, detail="Photo not found")
+        photo_uri = orjson.loads(r.content).get("photoUri")
+        if not photo_uri:
+            raise HTTPException(status_code=404, detail="Photo not found")
+        _PHOTO_URI_CACHE[ck] = photo_uri
+    return RedirectResponse(photo_uri, status_code=302)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Regenerate every *_data.js file used by the HTML pages in one run.
+
+Each category parses its source JSON once, reshapes it with the matching
+extract_*.py transform, and writes `const locationsData = [...];` directly.
+
+Usage:
+    python extract_all.py [category ...]
+
+Examples:
+    # Rebuild all data files
+    python extract_all.py
+
+    # Rebuild only the dental and urgent care files
+    python extract_all.py dental urgent_care
+"""
+
+import sys
+
+import orjson
+
+import extract_behavioral_health_data
+import extract_dental_locations_data
+import extract_primary_care_data
+import extract_urgent_care_data
+
+# category -> (input_json, transform_fn, output_js)
+# extract_dental_data.py (per-provider Delta Dental file) is not listed: it produces an
+# alternative dental_data.js and is still run on its own.
+CATEGORIES = {
+    'dental': (
+        extract_dental_locations_data.INPUT_FILE,
+        extract_dental_locations_data.transform,
+        'dental_data.js',
+    ),
+    'mental_health': (
+        extract_behavioral_health_data.INPUT_FILE,
+        extract_behavioral_health_data.transform,
+        'mental_health_data.js',
+    ),
+    'primary_care': (
+        extract_primary_care_data.INPUT_FILE,
+        extract_primary_care_data.transform,
+        'primary_care_data.js',
+    ),
+    'urgent_care': (
+        extract_urgent_care_data.INPUT_FILE,
+        extract_urgent_care_data.transform,
+        'urgent_care_data.js',
+    ),
+}
+
+
+def extract_category(category):
+    """Load, transform and write one category. Returns (category, output_js, location_count)."""
+    input_json, transform, output_js = CATEGORIES[category]
+
+    with open(input_json, 'rb') as f:
+        data = orjson.loads(f.read())
+
+    locations = transform(data)
+
+    with open(output_js, 'wb') as f:
+        f.write(b'const locationsData = ' + orjson.dumps(locations, option=orjson.OPT_INDENT_2) + b';\n')
+
+    return category, output_js, len(locations)
+
+
+def main():
+    """Main function to run the script."""
+    categories = sys.argv[1:] or list(CATEGORIES)
+    unknown = [c for c in categories if c not in CATEGORIES]
+    if unknown:
+        print(f"Error: Unknown category {', '.join(unknown)}. Choose from: {', '.join(CATEGORIES)}")
+        sys.exit(1)
+
+    for category in categories:
+        _, output_js, count = extract_category(category)
+        print(f"[OK] {category}: {count} locations written to {output_js}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,28 @@
 #!/usr/bin/env python3
 """Extract behavioral health providers from grouped JSON and format for HTML embedding."""
 
-import json
+import orjson
 
-# Load the grouped data
-with open('behavioral_health_grouped_by_address.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+INPUT_FILE = 'behavioral_health_grouped_by_address.json'
 
-# Get all locations (all are behavioral health)
-behavioral_health_locations = []
-for loc in data['locations']:
-    behavioral_health_locations.append({
-        'location': loc['location'],
-        'provider_count': loc['provider_count'],
-        'providers': loc['providers']
-    })
 
-# Output as JavaScript variable
-js_output = 'const locationsData = ' + json.dumps(behavioral_health_locations, indent=2, ensure_ascii=False) + ';'
-print(js_output)
+def transform(data):
+    """Get all locations (all are behavioral health)."""
+    behavioral_health_locations = []
+    for loc in data['locations']:
+        behavioral_health_locations.append({
+            'location': loc['location'],
+            'provider_count': loc['provider_count'],
+            'providers': loc['providers']
+        })
+    return behavioral_health_locations
+
+
+if __name__ == '__main__':
+    # Load the grouped data
+    with open(INPUT_FILE, 'rb') as f:
+        data = orjson.loads(f.read())
+
+    # Output as JavaScript variable
+    js_output = 'const locationsData = ' + orjson.dumps(transform(data), option=orjson.OPT_INDENT_2).decode('utf-8') + ';'
+    print(js_output)
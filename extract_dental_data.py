@@ -1,21 +1,26 @@
 #!/usr/bin/env python3
 """Extract and group Delta Dental providers by address for HTML embedding."""
 
-import json
 import re
-from collections import defaultdict
+
+import orjson
+
+INPUT_FILE = 'ucship_delta_dental_providers_2026-01-10.json'
+
+_WS_RE = re.compile(r'\s+')
+_SUITE_RE = re.compile(r'\s*(ste|suite|unit|apt|apartment)\s*\.?\s*[a-z0-9]+.*$', re.IGNORECASE)
 
 def normalize_address(address):
     """Normalize address string for comparison."""
     if not address or address == 'null':
         return ''
-    return re.sub(r'\s+', ' ', str(address).strip().lower())
+    return _WS_RE.sub(' ', str(address).strip().lower())
 
 def get_base_address(address_str):
     """Get base address without suite/unit numbers."""
     if not address_str or address_str == 'null':
         return ''
-    base = re.sub(r'\s*(ste|suite|unit|apt|apartment)\s*\.?\s*[a-z0-9]+.*$', '', address_str, flags=re.IGNORECASE)
+    base = _SUITE_RE.sub('', address_str)
     return base.strip().lower() if base else ''
 
 def create_location_key(provider, use_base_address=False):
@@ -47,70 +52,55 @@ def get_full_address(provider):
     
     return ', '.join(parts) if parts else None
 
-# Load the Delta Dental data
-with open('ucship_delta_dental_providers_2026-01-10.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+def nn(value):
+    """Treat missing, empty and literal 'null' values as None."""
+    return None if value in (None, 'null', '') else value
 
-# Group providers by address (using base address to group by building)
-grouped = defaultdict(list)
-for provider in data['providers']:
-    # Skip providers without valid addresses
-    if not provider.get('address') or provider.get('address') == 'null':
-        continue
-    
-    key = create_location_key(provider, use_base_address=True)
-    grouped[key].append(provider)
+def transform(data):
+    """Group providers by address (using base address to group by building)."""
+    # Single pass: each location entry is created from its first provider and the
+    # formatted providers are appended as they are seen
+    groups = {}
+    for provider in data['providers']:
+        # Skip providers without valid addresses
+        if nn(provider.get('address')) is None:
+            continue
 
-# Build locations array
-locations = []
-for key, providers in grouped.items():
-    if not providers:
-        continue
-    
-    # Use the first provider's address info for the location
-    first_provider = providers[0]
-    full_address = get_full_address(first_provider)
-    
-    if not full_address:
-        continue
-    
-    # Extract location info
-    location = {
-        'address': first_provider.get('address') or '',
-        'city': first_provider.get('city') or '',
-        'state': first_provider.get('state') or '',
-        'zip': first_provider.get('zip') or '',
-        'full_address': full_address,
-        'phone': first_provider.get('phone') or None,
-        'county': None  # Delta Dental data doesn't have county
-    }
-    
-    # Clean up phone - remove null
-    if location['phone'] == 'null':
-        location['phone'] = None
-    
-    # Format providers for display
-    formatted_providers = []
-    for p in providers:
-        formatted_provider = {
-            'name': p.get('name') or 'Dental Provider',
-            'specialty': p.get('specialty') or 'Dental',
-            'phone': p.get('phone') or None,
-            'website': p.get('website') or None
-        }
-        # Clean up null values
-        if formatted_provider['phone'] == 'null':
-            formatted_provider['phone'] = None
-        if formatted_provider['website'] == 'null':
-            formatted_provider['website'] = None
-        formatted_providers.append(formatted_provider)
-    
-    locations.append({
-        'location': location,
-        'provider_count': len(formatted_providers),
-        'providers': formatted_providers
-    })
+        key = create_location_key(provider, use_base_address=True)
+        entry = groups.get(key)
+        if entry is None:
+            entry = groups[key] = {
+                'location': {
+                    'address': provider.get('address') or '',
+                    'city': provider.get('city') or '',
+                    'state': provider.get('state') or '',
+                    'zip': provider.get('zip') or '',
+                    'full_address': get_full_address(provider),
+                    'phone': nn(provider.get('phone')),
+                    'county': None  # Delta Dental data doesn't have county
+                },
+                'provider_count': 0,
+                'providers': []
+            }
+
+        # Format provider for display
+        entry['providers'].append({
+            'name': provider.get('name') or 'Dental Provider',
+            'specialty': provider.get('specialty') or 'Dental',
+            'phone': nn(provider.get('phone')),
+            'website': nn(provider.get('website'))
+        })
+
+    locations = list(groups.values())
+    for entry in locations:
+        entry['provider_count'] = len(entry['providers'])
+    return locations
+
+if __name__ == '__main__':
+    # Load the Delta Dental data
+    with open(INPUT_FILE, 'rb') as f:
+        data = orjson.loads(f.read())
 
-# Output as JavaScript variable
-js_output = 'const locationsData = ' + json.dumps(locations, indent=2, ensure_ascii=False) + ';'
-print(js_output)
+    # Output as JavaScript variable
+    js_output = 'const locationsData = ' + orjson.dumps(transform(data), option=orjson.OPT_INDENT_2).decode('utf-8') + ';'
+    print(js_output)
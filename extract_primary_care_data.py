@@ -1,23 +1,30 @@
 #!/usr/bin/env python3
 """Extract primary care providers from grouped JSON and format for HTML embedding."""
 
-import json
+import orjson
 
-# Load the grouped data
-with open('ucship_anthem_providers_by_address_base.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+INPUT_FILE = 'ucship_anthem_providers_by_address_base.json'
 
-# Filter for primary care providers only
-primary_care_locations = []
-for loc in data['locations']:
-    primary_care_providers = [p for p in loc['providers'] if p.get('original_category') == 'primary_care']
-    if primary_care_providers:
-        primary_care_locations.append({
-            'location': loc['location'],
-            'provider_count': len(primary_care_providers),
-            'providers': primary_care_providers
-        })
 
-# Output as JavaScript variable
-js_output = 'const locationsData = ' + json.dumps(primary_care_locations, indent=2, ensure_ascii=False) + ';'
-print(js_output)
+def transform(data):
+    """Filter for primary care providers only."""
+    primary_care_locations = []
+    for loc in data['locations']:
+        primary_care_providers = [p for p in loc['providers'] if p.get('original_category') == 'primary_care']
+        if primary_care_providers:
+            primary_care_locations.append({
+                'location': loc['location'],
+                'provider_count': len(primary_care_providers),
+                'providers': primary_care_providers
+            })
+    return primary_care_locations
+
+
+if __name__ == '__main__':
+    # Load the grouped data
+    with open(INPUT_FILE, 'rb') as f:
+        data = orjson.loads(f.read())
+
+    # Output as JavaScript variable
+    js_output = 'const locationsData = ' + orjson.dumps(transform(data), option=orjson.OPT_INDENT_2).decode('utf-8') + ';'
+    print(js_output)
@@ -4,15 +4,13 @@
 import json
 import re
 
-# Read the file as text first to handle NaN
-with open('ucship_delta_dental_providers_2026-01-10.json', 'r', encoding='utf-8') as f:
-    content = f.read()
+import orjson
 
-# Replace NaN with null (valid JSON)
-content = re.sub(r'\bNaN\b', 'null', content)
+_WS_RE = re.compile(r'\s+')
 
-# Parse the JSON
-data = json.loads(content)
+# Parse the JSON, mapping NaN (and +/-Infinity) to None so they are written back as null
+with open('ucship_delta_dental_providers_2026-01-10.json', 'r', encoding='utf-8') as f:
+    data = json.load(f, parse_constant=lambda _: None)
 
 # Clean up addresses - remove \r\n and normalize
 for provider in data['providers']:
@@ -20,11 +18,11 @@ for provider in data['providers']:
         # Replace \r\n with space and clean up
         provider['address'] = provider['address'].replace('\r\n', ' ').replace('\n', ' ').strip()
         # Normalize multiple spaces
-        provider['address'] = re.sub(r'\s+', ' ', provider['address'])
+        provider['address'] = _WS_RE.sub(' ', provider['address'])
 
 # Write back the cleaned JSON
-with open('ucship_delta_dental_providers_2026-01-10.json', 'w', encoding='utf-8') as f:
-    json.dump(data, f, indent=2, ensure_ascii=False)
+with open('ucship_delta_dental_providers_2026-01-10.json', 'wb') as f:
+    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 print(f"Fixed JSON file:")
 print(f"  - Replaced NaN with null")
@@ -2,6 +2,8 @@
 """
 Script to group JSON provider data by address location.
 Groups providers that share the same address, city, state, and zip code.
+The input is parsed and the output written with orjson (pip install orjson);
+the output is streamed to disk one location at a time.
 
 Usage:
     python group_by_address.py [input_file] [output_file] [use_base_address]
@@ -22,16 +24,104 @@ Examples:
     python group_by_address.py input.json output.json true
 """
 
-import json
+import heapq
 import re
+import sys
 from collections import defaultdict
-from typing import Dict, List, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Dict, List, Any, Tuple
 
+import orjson
 
+
+# Address normalization: addresses are split into words and each abbreviation
+# (with an optional trailing '.') is looked up and replaced by its canonical form.
+_CANON = {
+    'st': 'street', 'street': 'street',
+    'ave': 'avenue', 'avenue': 'avenue',
+    'rd': 'road', 'road': 'road',
+    'blvd': 'boulevard', 'boulevard': 'boulevard',
+    'dr': 'drive', 'drive': 'drive',
+    'ct': 'court', 'court': 'court',
+    'ln': 'lane', 'lane': 'lane',
+    'ste': 'ste', 'suite': 'ste',
+    'unit': 'unit', 'apt': 'unit', 'apartment': 'unit',
+}
+# Commas separate words just like whitespace
+_PUNCT_TABLE = str.maketrans(',', ' ')
+# Suite/unit prefix glued to its identifier by '.', '#' or a digit ('ste101', 'ste.a',
+# 'ste#4', 'apt.4b') is split into two words; plain words like 'stevens' are left alone
+_GLUED_UNIT_RE = re.compile(r'(ste|suite|unit|apt|apartment)(?:\.|(?=[#\d]))(#?\w.*)')
+_BASE_RE = re.compile(r'\s*(ste|suite|unit|apt|apartment)\s*\.?\s*[a-z0-9]+.*$', re.IGNORECASE)
+
+# Location key fields, plucked in one C-level call (falls back to .get when one is missing)
+_get_key_fields = itemgetter('address', 'city', 'state', 'zip')
+
+
+@dataclass(slots=True)
+class Location:
+    """
+    One grouped location: representative address info plus its providers.
+    Kept as a slotted object internally; converted to the output dict shape when written
+    and before group_providers_by_address returns.
+    """
+    address: Any
+    city: Any
+    state: Any
+    zip: Any
+    county: Any
+    full_address: str
+    phone: Any
+    website: Any
+    distance_miles: Any
+    providers: List[Dict[str, Any]]
+    
+    @property
+    def provider_count(self) -> int:
+        return len(self.providers)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "location": {
+                "address": self.address,
+                "city": self.city,
+                "state": self.state,
+                "zip": self.zip,
+                "county": self.county,
+                "full_address": self.full_address,
+                "phone": self.phone,
+                "website": self.website,
+                "distance_miles": self.distance_miles,
+            },
+            "provider_count": self.provider_count,
+            "providers": self.providers,
+        }
+
+
+def _canonical_word(word: str) -> str:
+    canon = _CANON.get(word.rstrip('.'))
+    if canon is not None:
+        return canon
+    glued = _GLUED_UNIT_RE.fullmatch(word)
+    if glued is not None:
+        return f"{_CANON[glued.group(1)]} {glued.group(2)}"
+    return word
+
+
+def _zip5(zip_code: str) -> str:
+    """ZIP+4 collapses to its 5-digit ZIP so '93117-2811' and '93117' group together."""
+    zip_code = zip_code.strip()
+    return zip_code.split('-', 1)[0].rstrip() if '-' in zip_code else zip_code
+
+
+@lru_cache(maxsize=None)
 def normalize_address(address: str) -> str:
     """
     Normalize address string for comparison.
     Standardizes formatting but keeps suite/unit info for better grouping.
+    Memoized: providers at the same location share the exact address string.
     """
     if not address:
         return ""
@@ -41,30 +131,13 @@ def normalize_address(address: str) -> str:
     if not address_str:
         return ""
     
-    # Convert to lowercase and strip whitespace
-    normalized = address_str.lower().strip()
-    
-    # Normalize common abbreviations (but keep suite/unit info)
-    # Standardize street type abbreviations
-    normalized = re.sub(r'\b(st|street)\b\.?', 'street', normalized)
-    normalized = re.sub(r'\b(ave|avenue)\b\.?', 'avenue', normalized)
-    normalized = re.sub(r'\b(rd|road)\b\.?', 'road', normalized)
-    normalized = re.sub(r'\b(blvd|boulevard)\b\.?', 'boulevard', normalized)
-    normalized = re.sub(r'\b(dr|drive)\b\.?', 'drive', normalized)
-    normalized = re.sub(r'\b(ct|court)\b\.?', 'court', normalized)
-    normalized = re.sub(r'\b(ln|lane)\b\.?', 'lane', normalized)
-    
-    # Normalize suite/unit abbreviations but keep the identifier
-    normalized = re.sub(r'\b(ste|suite)\s*\.?\s*', 'ste ', normalized)
-    normalized = re.sub(r'\b(unit|apt|apartment)\s*\.?\s*', 'unit ', normalized)
-    
-    # Remove extra whitespace and punctuation inconsistencies
-    normalized = re.sub(r'[,\s]+', ' ', normalized)
-    normalized = normalized.strip()
-    
-    return normalized
+    # Lowercase, split on whitespace/commas, and canonicalize street type and
+    # suite/unit abbreviations word by word (keeps the suite/unit identifier)
+    words = address_str.lower().translate(_PUNCT_TABLE).split()
+    return ' '.join([_canonical_word(w) for w in words])
 
 
+@lru_cache(maxsize=None)
 def get_base_address(address: str) -> str:
     """
     Extract base address without suite/unit numbers for broader grouping.
@@ -77,115 +150,128 @@ def get_base_address(address: str) -> str:
         return ""
     
     # Remove suite/unit information for base address grouping
-    base = re.sub(r'\s*(ste|suite|unit|apt|apartment)\s*\.?\s*[a-z0-9]+.*$', '', address_str, flags=re.IGNORECASE)
+    base = _BASE_RE.sub('', address_str)
     base = base.strip()
     return base.lower() if base else ""
 
 
-def create_location_key(provider: Dict[str, Any], use_base_address: bool = False) -> str:
+def create_location_key(provider: Dict[str, Any], use_base_address: bool = False) -> Tuple[str, str, str, str]:
     """
     Create a unique key for grouping providers by location.
-    Uses address, city, state, and zip code.
+    Uses address, city, state, and zip code (ZIP+4 folded to the 5-digit ZIP).
     
     Args:
         provider: Provider dictionary
         use_base_address: If True, groups by base address (without suite numbers)
     """
-    if use_base_address:
-        address = get_base_address(provider.get('address') or '')
-    else:
-        address = normalize_address(provider.get('address') or '')
+    try:
+        address, city, state, zip_code = _get_key_fields(provider)
+    except KeyError:
+        get = provider.get
+        address, city, state, zip_code = get('address'), get('city'), get('state'), get('zip')
     
-    city = (provider.get('city') or '').lower().strip()
-    state = (provider.get('state') or '').lower().strip()
-    zip_code = (provider.get('zip') or '').strip()
+    address = address or ''
+    address = get_base_address(address) if use_base_address else normalize_address(address)
+    # City/state/zip repeat across most providers: intern them so keys share one string
+    # object and its cached hash (addresses are mostly unique, so they are not interned)
+    city = sys.intern(city.lower().strip()) if city else ''
+    state = sys.intern(state.lower().strip()) if state else ''
+    zip_code = sys.intern(_zip5(zip_code)) if zip_code else ''
     
-    # Create a composite key
-    key = f"{address}|{city}|{state}|{zip_code}"
-    return key
+    # Composite key as a tuple (no string building; orders field by field)
+    return (address, city, state, zip_code)
 
 
 def get_full_address(provider: Dict[str, Any]) -> str:
     """
     Get the full formatted address string from a provider.
     """
-    parts = []
-    if provider.get('address'):
-        parts.append(str(provider['address']))
-    if provider.get('city'):
-        parts.append(str(provider['city']))
-    if provider.get('state'):
-        parts.append(str(provider['state']))
-    if provider.get('zip'):
-        parts.append(str(provider['zip']))
-    
-    return ', '.join(parts)
+    # Values come straight from JSON strings, so no str() coercion is needed
+    get = provider.get
+    return ', '.join([v for v in (get('address'), get('city'), get('state'), get('zip')) if v])
 
 
-def group_providers_by_address(input_file: str, output_file: str = None, use_base_address: bool = False) -> Dict[str, Any]:
+def _dumps_indented(value: Any, level: int) -> bytes:
+    """orjson.dumps with 2-space indent, shifted to sit `level` levels deep in an outer document."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n' + b'  ' * level)
+
+
+def write_grouped_output(output_file: str, output_data: Dict[str, Any]) -> None:
     """
-    Read JSON file and group providers by address location.
-    
-    Args:
-        input_file: Path to input JSON file
-        output_file: Path to output JSON file (optional)
-    
-    Returns:
-        Dictionary with grouped providers
+    Write grouped output as indented JSON, one location at a time.
+    Produces the same bytes as dumping output_data in one go, without ever
+    holding the whole serialized locations list in memory.
+    """
+    locations = output_data["locations"]
+    with open(output_file, 'wb') as f:
+        f.write(b'{\n  "meta": ' + _dumps_indented(output_data["meta"], 1))
+        f.write(b',\n  "meta_grouped": ' + _dumps_indented(output_data["meta_grouped"], 1))
+        f.write(b',\n  "locations": [')
+        for i, location_entry in enumerate(locations):
+            f.write(b',\n    ' if i else b'\n    ')
+            f.write(_dumps_indented(location_entry.to_dict(), 2))
+        f.write(b'\n  ]\n}' if locations else b']\n}')
+
+
+def _group_locations(input_file: str, output_file: str = None, use_base_address: bool = False) -> Dict[str, Any]:
+    """
+    Group providers by address location (see group_providers_by_address).
+    'locations' is a list of Location objects; main uses this directly to skip the dict conversion.
     """
-    # Read input JSON
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Parse the input JSON in one call, then group providers as they are tagged
+    # (providers keep their input order within a location)
+    with open(input_file, 'rb') as f:
+        data = orjson.loads(f.read())
+    meta = data.get('meta', {})
     
-    # Extract all providers from all categories
-    all_providers = []
+    location_groups = defaultdict(list)
+    total_providers = 0
     for category, providers in data.get('grouped_providers', {}).items():
         for provider in providers:
-            # Add category info to each provider
-            provider_with_category = provider.copy()
-            provider_with_category['original_category'] = category
-            all_providers.append(provider_with_category)
+            # Add category info to each provider (freshly parsed, so tag it in place)
+            provider['original_category'] = category
+            location_key = create_location_key(provider, use_base_address=use_base_address)
+            location_groups[location_key].append(provider)
+        total_providers += len(providers)
     
-    # Group providers by location
-    location_groups = defaultdict(list)
-    for provider in all_providers:
-        location_key = create_location_key(provider, use_base_address=use_base_address)
-        location_groups[location_key].append(provider)
+    # Normalized addresses are only needed for keying; release the memo tables
+    normalize_address.cache_clear()
+    get_base_address.cache_clear()
     
     # Create output structure
-    grouped_by_location = []
-    for location_key, providers in sorted(location_groups.items()):
+    keyed_locations = []
+    for location_key, providers in location_groups.items():
         # Get representative address info from first provider
         first_provider = providers[0]
         full_address = get_full_address(first_provider)
         
-        location_entry = {
-            "location": {
-                "address": first_provider.get('address', ''),
-                "city": first_provider.get('city', ''),
-                "state": first_provider.get('state', ''),
-                "zip": first_provider.get('zip', ''),
-                "county": first_provider.get('county', ''),
-                "full_address": full_address,
-                "phone": first_provider.get('phone', ''),
-                "website": first_provider.get('website'),
-                "distance_miles": first_provider.get('distance_miles'),
-            },
-            "provider_count": len(providers),
-            "providers": providers
-        }
+        location_entry = Location(
+            address=first_provider.get('address', ''),
+            city=first_provider.get('city', ''),
+            state=first_provider.get('state', ''),
+            zip=first_provider.get('zip', ''),
+            county=first_provider.get('county', ''),
+            full_address=full_address,
+            phone=first_provider.get('phone', ''),
+            website=first_provider.get('website'),
+            distance_miles=first_provider.get('distance_miles'),
+            providers=providers,
+        )
         
-        grouped_by_location.append(location_entry)
+        # Different keys can share a full_address (empty fields are skipped), so ties
+        # are broken by the key in its original 'address|city|state|zip' string form
+        keyed_locations.append((full_address, '|'.join(location_key), location_entry))
     
-    # Sort by address for easier reading
-    grouped_by_location.sort(key=lambda x: x['location']['full_address'])
+    # Sort by address for easier reading (the only sort; groups are built in any order)
+    keyed_locations.sort(key=itemgetter(0, 1))
+    grouped_by_location = [location_entry for _, _, location_entry in keyed_locations]
     
     # Create output structure
     output_data = {
-        "meta": data.get('meta', {}).copy(),
+        "meta": meta,
         "meta_grouped": {
             "total_locations": len(grouped_by_location),
-            "total_providers": len(all_providers),
+            "total_providers": total_providers,
             "grouping_method": "by_base_address" if use_base_address else "by_address_location"
         },
         "locations": grouped_by_location
@@ -193,18 +279,32 @@ def group_providers_by_address(input_file: str, output_file: str = None, use_bas
     
     # Write output file if specified
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
-        print(f"[OK] Grouped {len(all_providers)} providers into {len(grouped_by_location)} locations")
+        write_grouped_output(output_file, output_data)
+        print(f"[OK] Grouped {total_providers} providers into {len(grouped_by_location)} locations")
         print(f"[OK] Output written to: {output_file}")
     
     return output_data
 
 
+def group_providers_by_address(input_file: str, output_file: str = None, use_base_address: bool = False) -> Dict[str, Any]:
+    """
+    Read JSON file and group providers by address location.
+    
+    Args:
+        input_file: Path to input JSON file
+        output_file: Path to output JSON file (optional)
+    
+    Returns:
+        Dictionary with grouped providers, shaped like the output JSON
+        ('locations' is a list of plain dicts sharing the provider lists)
+    """
+    output_data = _group_locations(input_file, output_file, use_base_address=use_base_address)
+    output_data["locations"] = [location_entry.to_dict() for location_entry in output_data["locations"]]
+    return output_data
+
+
 def main():
     """Main function to run the script."""
-    import sys
-    
     input_file = 'ucship_anthem_providers_grouped_2026-01-10.json'
     output_file = 'ucship_anthem_providers_by_address.json'
     use_base_address = False
@@ -218,7 +318,7 @@ def main():
         use_base_address = sys.argv[3].lower() in ('true', '1', 'yes', 'base')
     
     try:
-        result = group_providers_by_address(input_file, output_file, use_base_address=use_base_address)
+        result = _group_locations(input_file, output_file, use_base_address=use_base_address)
         
         # Print summary statistics
         print("\n" + "="*60)
@@ -229,17 +329,15 @@ def main():
         print(f"Average providers per location: {result['meta_grouped']['total_providers'] / result['meta_grouped']['total_locations']:.2f}")
         
         # Show locations with most providers
-        locations_by_count = sorted(result['locations'], 
-                                   key=lambda x: x['provider_count'], 
-                                   reverse=True)
+        top_locations = heapq.nlargest(10, result['locations'], key=attrgetter('provider_count'))
         print("\nTop 10 locations by provider count:")
-        for i, loc in enumerate(locations_by_count[:10], 1):
-            print(f"  {i}. {loc['location']['full_address']} - {loc['provider_count']} providers")
+        for i, loc in enumerate(top_locations, 1):
+            print(f"  {i}. {loc.full_address} - {loc.provider_count} providers")
         
     except FileNotFoundError:
         print(f"Error: File '{input_file}' not found.")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error: Invalid JSON in '{input_file}': {e}")
         sys.exit(1)
     except Exception as e: